@@ -2,11 +2,28 @@
 This script extracts glyphs from a WOFF2 font file and saves them as individual SVG files.
 
 Usage:
-    python extract_glyphs.py <path_to_woff_file> <output_directory>
+    python extract_glyphs.py <path_to_woff_file> <output_directory> [--precision N] [--compact]
+                              [--uniform-bbox] [--compress {none,gzip,brotli}] [--sprite FILENAME]
+                              [--sync]
 
 Arguments:
     <path_to_woff_file>   Path to the input WOFF2 font file.
     <output_directory>    Path to the directory where the SVG files will be saved.
+    --precision N         Maximum number of decimal places in path coordinates
+                          (default: 1, 0 rounds to integers).
+    --compact             Use relative path commands where they are shorter.
+    --uniform-bbox        Use the font-wide bounding box as every glyph's viewBox
+                          (also keeps empty glyphs).
+    --compress {none,gzip,brotli}
+                          Compress the SVG files as .svgz (gzip) or .svg.br
+                          (brotli) (default: none).
+    --sprite FILENAME     Save all glyphs as <symbol> elements in a single SVG
+                          sprite with this name (in the output directory), plus
+                          a JSON index, instead of one file per glyph. The sprite
+                          gets the .svg, .svgz or .svg.br extension matching
+                          --compress.
+    --sync                Flush all written files to disk once at the end
+                          (files are not fsynced individually). Unix only.
 
 Dependencies:
     - fontTools (install with `pip install fonttools`)
@@ -16,11 +33,31 @@ Description:
     This script loads a WOFF2 font file and extracts each glyph from the 'glyf' table.
     For each glyph, it calculates the bounding box to properly adjust the SVG canvas size
     and avoids clipping. The glyphs are then saved as individual SVG files in the specified
-    output directory.
+    output directory. Path data stays in font coordinates and is flipped into SVG
+    coordinates by a transform on the path element.
 
 Functions:
-    extract_glyphs_to_svg(woff_path, output_dir)
+    extract_glyphs_to_svg(woff_path, output_dir, precision=1, compact=False, uniform_bbox=False,
+                          compress='none', sprite=None, sync=False)
         Loads the WOFF2 file, extracts glyphs, and saves them as SVG files.
+        Glyphs are split into chunks of similar estimated cost and extracted
+        in parallel, one worker process per CPU.
+
+    partition_glyphs(glyphs, costs, count)
+        Splits glyphs into chunks of similar total cost (longest processing time first).
+
+    draw_chunk(woff_path, glyphs, precision=1, compact=False, uniform_bbox=False)
+        Draws a chunk of glyphs, returning their viewBoxes and path data. Runs in a worker process.
+
+    process_chunk(woff_path, glyphs, output_dir, precision=1, compact=False, uniform_bbox=False,
+                  compress='none')
+        Draws a chunk of glyphs and saves them as SVG files. Runs in a worker process.
+
+    write_sprite(sprite_filename, drawings, compress='none')
+        Saves drawn glyphs as a single SVG sprite plus a JSON index.
+
+    write_file(filename, data)
+        Writes bytes to a file with os.open()/os.write(), without fsync.
 
 Example:
     python extract_glyphs.py path/to/your/font.woff2 path/to/output/directory
@@ -31,108 +68,601 @@ Author:
 Date:
     May 16th 2024 
 """
-import sys
+import argparse
 import os
+import gzip
+import json
+import heapq
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from fontTools.ttLib import TTFont
 from fontTools.pens.svgPathPen import SVGPathPen
-from fontTools.pens.boundsPen import BoundsPen
 from fontTools.pens.transformPen import TransformPen
-import re
+from fontTools.misc.transform import Identity
+from math import inf
+from xml.sax.saxutils import quoteattr
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# File extension for each --compress option
+COMPRESSED_EXTENSIONS = {'none': '.svg', 'gzip': '.svgz', 'brotli': '.svg.br'}
+
+# Flips font coordinates (Y up) into SVG coordinates (Y down)
+SVG_FLIP_TRANSFORM = 'scale(1 -1)'
+
+# Replaces invalid filename characters with underscores
+_FS_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
 
 def sanitize_filename(name):
     # Remove invalid filename characters
-    return re.sub(r'[<>:"/\\|?*]', '_', name)
+    return name.translate(_FS_TABLE)
+
+class _FormatCache(dict):
+    """
+    Memoizes a number formatting function. Glyph coordinates repeat heavily
+    within a font, so most lookups are served by dict.__getitem__ in C.
+    """
+    def __init__(self, fmt):
+        super().__init__()
+        self.fmt = fmt
+
+    def __missing__(self, value):
+        text = self[value] = self.fmt(value)
+        return text
+
+def number_formatter(precision):
+    """
+    Returns a function that formats a number with at most `precision` decimal
+    places, dropping trailing zeros (and rounding to integers if precision is 0).
+    Results are memoized, so the function should be used within one worker.
+    """
+    if precision <= 0:
+        def ntos(value):
+            return str(round(value))
+    else:
+        spec = f".{precision}f"
+        def ntos(value):
+            text = format(value, spec).rstrip('0').rstrip('.')
+            return '0' if text == '-0' else text
+    # Equal ints and floats share a cache entry, which is fine since they format the same
+    return _FormatCache(ntos).__getitem__
+
+class BoundsSVGPen(SVGPathPen):
+    """
+    SVGPathPen that tracks the glyph's control bounding box (the box around
+    all on- and off-curve points, like ControlBoundsPen) while drawing, so
+    each glyph only needs to be traversed once. The control box always
+    contains the outline, so it is safe to use as the viewBox.
+    
+    Coordinates and bounds are left in font space (Y up); the Y axis is
+    flipped once per path with SVG_FLIP_TRANSFORM instead of per point.
+    
+    glyph_set is the font's 'glyf' table, which is used to draw components.
+    
+    With compact=True, each command is written in relative form when that
+    is shorter than the absolute form, and repeated command letters are
+    omitted. With track_bounds=False, no bounds are collected and `bounds`
+    is always None.
+    """
+    def __init__(self, glyph_set, ntos=str, compact=False, track_bounds=True):
+        super().__init__(glyph_set, ntos=ntos)
+        self.compact = compact
+        if not track_bounds:
+            self._add_point = self._skip_point
+        self.reset()
+
+    def reset(self):
+        """Clears path data and bounds so the pen can be reused for another glyph."""
+        self._commands.clear()
+        self._lastCommand = None
+        self._lastX = self._lastY = None
+        self.min_x = self.min_y = inf
+        self.max_x = self.max_y = -inf
+        # Current point and subpath start as written to the path, for compact output
+        self._pos = [0.0, 0.0]
+        self._start = (0.0, 0.0)
+        self._move_from = (0.0, 0.0)
+        self._lastLetter = None
+
+    @property
+    def bounds(self):
+        if self.min_x == inf:
+            return None
+        return self.min_x, self.min_y, self.max_x, self.max_y
+
+    def _add_point(self, x, y):
+        if x < self.min_x:
+            self.min_x = x
+        if x > self.max_x:
+            self.max_x = x
+        if y < self.min_y:
+            self.min_y = y
+        if y > self.max_y:
+            self.max_y = y
+
+    @staticmethod
+    def _skip_point(x, y):
+        pass
+
+    def _emit(self, cmd, values):
+        """
+        Appends a command in compact form. values is a sequence of
+        (axis, value) pairs with absolute coordinates, axis 0 for x and 1 for y.
+        """
+        ntos = self._ntos
+        pos = self._pos
+        absolute = []
+        relative = []
+        written = []
+        for axis, value in values:
+            text = ntos(value)
+            # Relative offsets are taken between written values so rounding doesn't accumulate
+            value = float(text)
+            absolute.append(text)
+            relative.append(ntos(value - pos[axis]))
+            written.append(value)
+        absolute = " ".join(absolute)
+        relative = " ".join(relative)
+        if len(relative) < len(absolute):
+            letter, text = cmd.lower(), relative
+        else:
+            letter, text = cmd, absolute
+        
+        # A repeated command (or a lineTo following a moveTo) can omit its letter
+        last = self._lastLetter
+        if letter != "M" and letter != "m" and (letter == last or (last, letter) in (("M", "L"), ("m", "l"))):
+            self._commands.append(text if text[0] == "-" else " " + text)
+        else:
+            self._commands.append(letter + text)
+        self._lastLetter = letter
+        
+        for (axis, _), value in zip(values, written):
+            pos[axis] = value
+
+    def addComponent(self, glyphName, transformation):
+        # 'glyf' table glyphs need the table passed in to draw their components
+        glyf = self.glyphSet
+        try:
+            glyph = glyf[glyphName]
+        except KeyError:
+            # Skip missing components, as DecomposingPen does by default
+            return
+        pen = self if transformation == Identity else TransformPen(self, transformation)
+        glyph.draw(pen, glyf)
+
+    # The segment methods below replace SVGPathPen's own, formatting each
+    # command with a single %-format and appending it to the command list
+    # instead of building it up by string concatenation.
+
+    def _moveTo(self, pt):
+        x, y = pt
+        self._add_point(x, y)
+        # A moveTo directly after another replaces it
+        if self._lastCommand == "M":
+            self._commands.pop()
+            if self.compact:
+                self._pos[:] = self._move_from
+        if self.compact:
+            self._move_from = tuple(self._pos)
+            self._emit("M", ((0, x), (1, y)))
+            self._start = tuple(self._pos)
+            self._lastCommand = "M"
+            self._lastX, self._lastY = x, y
+            return
+        ntos = self._ntos
+        self._commands.append("M%s %s" % (ntos(x), ntos(y)))
+        self._lastCommand = "M"
+        self._lastX, self._lastY = x, y
+
+    def _lineTo(self, pt):
+        x, y = pt
+        self._add_point(x, y)
+        ntos = self._ntos
+        if x == self._lastX:
+            if y == self._lastY:
+                # Duplicate point
+                return
+            if self.compact:
+                self._emit("V", ((1, y),))
+            else:
+                self._commands.append("V" + ntos(y))
+            self._lastCommand = "V"
+        elif y == self._lastY:
+            if self.compact:
+                self._emit("H", ((0, x),))
+            else:
+                self._commands.append("H" + ntos(x))
+            self._lastCommand = "H"
+        elif self.compact:
+            self._emit("L", ((0, x), (1, y)))
+            self._lastCommand = "L"
+        elif self._lastCommand == "M":
+            # Implicit lineTo following a moveTo
+            self._commands.append(" %s %s" % (ntos(x), ntos(y)))
+        else:
+            self._commands.append("L%s %s" % (ntos(x), ntos(y)))
+            self._lastCommand = "L"
+        self._lastX, self._lastY = x, y
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        x1, y1 = pt1
+        x2, y2 = pt2
+        x3, y3 = pt3
+        self._add_point(x1, y1)
+        self._add_point(x2, y2)
+        self._add_point(x3, y3)
+        if self.compact:
+            self._emit("C", ((0, x1), (1, y1), (0, x2), (1, y2), (0, x3), (1, y3)))
+        else:
+            ntos = self._ntos
+            self._commands.append("C%s %s %s %s %s %s" % (ntos(x1), ntos(y1), ntos(x2), ntos(y2), ntos(x3), ntos(y3)))
+        self._lastCommand = "C"
+        self._lastX, self._lastY = x3, y3
+
+    def _qCurveToOne(self, pt1, pt2):
+        x1, y1 = pt1
+        x2, y2 = pt2
+        self._add_point(x1, y1)
+        self._add_point(x2, y2)
+        if self.compact:
+            self._emit("Q", ((0, x1), (1, y1), (0, x2), (1, y2)))
+        else:
+            ntos = self._ntos
+            self._commands.append("Q%s %s %s %s" % (ntos(x1), ntos(y1), ntos(x2), ntos(y2)))
+        self._lastCommand = "Q"
+        self._lastX, self._lastY = x2, y2
+
+    def _closePath(self):
+        super()._closePath()
+        # Closing a subpath moves the current point back to its start
+        self._pos[:] = self._start
+        self._lastLetter = "Z"
+
+def outline_key(glyph, offset=0):
+    """
+    Returns a hashable key identifying the outline of a 'glyf' table glyph,
+    so glyphs that share an outline can reuse a single drawing. `offset` is
+    the horizontal offset the glyph is drawn at; composites ignore it when
+    drawing, so it is only part of the key for simple glyphs. Returns None
+    for glyphs that should not be cached.
+    """
+    if glyph.isComposite():
+        try:
+            return ('composite',) + tuple(c.getComponentInfo() for c in glyph.components)
+        except AttributeError:
+            # Components positioned by point matching have no x/y offset
+            return None
+    if glyph.numberOfContours <= 0:
+        return None
+    return ('simple', offset, tuple(glyph.coordinates), tuple(glyph.endPtsOfContours), tuple(glyph.flags))
+
+def glyph_cost(glyf, glyph_name, costs):
+    """
+    Returns a cheap estimate of the work needed to draw a glyph, used to
+    balance chunks between workers: the size of its compiled data (or its
+    point count, if already expanded) plus the cost of any components.
+    Results are memoized in the `costs` dict.
+    """
+    cost = costs.get(glyph_name)
+    if cost is None:
+        # Use the raw Glyph object so it isn't expanded just for this
+        glyph = glyf.glyphs[glyph_name]
+        data = getattr(glyph, 'data', None)
+        if data is not None:
+            cost = len(data)
+        else:
+            cost = len(glyph.coordinates) if glyph.numberOfContours > 0 else 0
+        costs[glyph_name] = 0  # guards against malformed cyclic components
+        cost += sum(glyph_cost(glyf, name, costs) for name in glyph.getComponentNames(glyf))
+        costs[glyph_name] = cost
+    return cost
+
+def partition_glyphs(glyphs, costs, count):
+    """
+    Splits glyphs into at most `count` chunks of similar total cost, using
+    longest-processing-time-first scheduling: glyphs are handed out most
+    expensive first, each to the chunk with the lowest total so far. Glyphs
+    keep their original order within each chunk.
+    """
+    chunks = [[] for _ in range(count)]
+    loads = [(0, i) for i in range(count)]
+    for index in sorted(range(len(glyphs)), key=lambda i: costs[i], reverse=True):
+        load, i = heapq.heappop(loads)
+        chunks[i].append(index)
+        heapq.heappush(loads, (load + costs[index], i))
+    return [[glyphs[index] for index in sorted(chunk)] for chunk in chunks if chunk]
 
-def extract_glyphs_to_svg(woff_path, output_dir):
+def draw_chunk(woff_path, glyphs, precision=1, compact=False, uniform_bbox=False):
+    """
+    Draws a chunk of glyphs. Each chunk opens its own TTFont so that it can
+    run in a separate worker process.
+    
+    glyphs is a list of (glyph_name, filename) pairs. Coordinates are written
+    with at most `precision` decimal places, using relative commands where
+    shorter if `compact` is set. Returns a list of
+    (glyph_name, filename, view_box, svg_path) tuples for the glyphs that have
+    an outline, where view_box is a tuple of the formatted
+    (min_x, min_y, width, height) in SVG coordinates. svg_path is in font
+    coordinates and must be drawn with SVG_FLIP_TRANSFORM.
+    
+    If `uniform_bbox` is set, every glyph gets the font-wide bounding box from
+    the 'head' table as its viewBox, and empty glyphs are included as well.
+    """
+    # Only 'glyf', 'hmtx' and 'head' are needed, so load tables lazily
+    font = TTFont(woff_path, lazy=True)
+    glyf = font['glyf']
+    hmtx = font['hmtx']
+    
+    # Drawings keyed by outline, shared between glyphs with identical outlines
+    outline_cache = {}
+    ntos = number_formatter(precision)
+    # The font-wide box replaces per-glyph bounds, so don't track them
+    pen = BoundsSVGPen(glyf, ntos=ntos, compact=compact, track_bounds=not uniform_bbox)
+    
+    # First pass: only draw, so the loop body stays small
+    drawn = []
+    for glyph_name, filename in glyphs:
+        glyph = glyf[glyph_name]
+        # Drawing straight from 'glyf' skips the glyph set wrapper, so apply
+        # its left side bearing offset here
+        offset = hmtx[glyph_name][1] - glyph.xMin if hasattr(glyph, 'xMin') else 0
+        key = outline_key(glyph, offset)
+        cached = outline_cache.get(key) if key is not None else None
+        
+        if cached is None:
+            # Draw the glyph once, collecting path data and bounding box
+            pen.reset()
+            glyph.draw(pen, glyf, offset)
+            cached = (pen.bounds, pen.getCommands())
+            if key is not None:
+                outline_cache[key] = cached
+        
+        drawn.append((glyph_name, filename, cached))
+    
+    # Second pass: format the viewBoxes
+    if uniform_bbox:
+        head = font['head']
+        view_box = (ntos(head.xMin), ntos(-head.yMax),
+                    ntos(head.xMax - head.xMin), ntos(head.yMax - head.yMin))
+        return [(glyph_name, filename, view_box, svg_path)
+                for glyph_name, filename, (bounds, svg_path) in drawn]
+    
+    drawings = []
+    for glyph_name, filename, (bounds, svg_path) in drawn:
+        if bounds:
+            # Format the bounds the same way as the path coordinates and take the
+            # size from the formatted values, so rounding can't clip the path
+            min_x, min_y, max_x, max_y = (float(ntos(value)) for value in bounds)
+            # Flipping the path maps font Y range [min_y, max_y] to [-max_y, -min_y]
+            view_box = (ntos(min_x), ntos(-max_y), ntos(max_x - min_x), ntos(max_y - min_y))
+            drawings.append((glyph_name, filename, view_box, svg_path))
+    return drawings
+
+def encode_svg(svg_content, compress='none'):
+    """
+    Encodes SVG content to bytes, compressed according to `compress`
+    ('none', 'gzip' or 'brotli').
+    """
+    # Path data is ASCII, which CPython encodes to UTF-8 with a plain copy;
+    # UTF-8 keeps sprite symbol ids made from non-ASCII glyph names valid.
+    svg_bytes = svg_content.encode('utf-8')
+    if compress == 'gzip':
+        svg_bytes = gzip.compress(svg_bytes, compresslevel=6, mtime=0)
+    elif compress == 'brotli':
+        svg_bytes = brotli.compress(svg_bytes, quality=5)
+    return svg_bytes
+
+def write_file(filename, data):
+    """
+    Writes bytes to a file with plain os.open()/os.write() calls, bypassing
+    Python's file objects. The file is not fsynced; call os.sync() once at the
+    end if the output needs to be durable.
+    """
+    # O_BINARY only exists (and matters) on Windows
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def process_chunk(woff_path, glyphs, output_dir, precision=1, compact=False, uniform_bbox=False,
+                  compress='none'):
+    """
+    Draws a chunk of glyphs and saves them as individual SVG files, see
+    draw_chunk(). Files are compressed according to `compress`. Returns a list
+    of (glyph_name, svg_filename) pairs for the SVG files written.
+    """
+    extracted = []
+    # Encoded SVG files, written out together once the chunk is drawn
+    outputs = []
+    extension = COMPRESSED_EXTENSIONS[compress]
+    
+    for glyph_name, filename, view_box, svg_path in draw_chunk(woff_path, glyphs, precision, compact, uniform_bbox):
+        min_x, min_y, width, height = view_box
+        svg_filename = os.path.join(output_dir, filename + extension)
+        
+        # Create SVG content, encoded up front for the batched write
+        svg_content = f'''<svg xmlns="http://www.w3.org/2000/svg" viewBox="{min_x} {min_y} {width} {height}" width="{width}" height="{height}">
+<path transform="{SVG_FLIP_TRANSFORM}" d="{svg_path}"/>
+</svg>'''
+        outputs.append((svg_filename, encode_svg(svg_content, compress)))
+        
+        extracted.append((glyph_name, svg_filename))
+    
+    # Save SVG files in one pass
+    for svg_filename, svg_bytes in outputs:
+        write_file(svg_filename, svg_bytes)
+    
+    return extracted
+
+def write_sprite(sprite_filename, drawings, compress='none'):
+    """
+    Saves drawings (as returned by draw_chunk()) as a single SVG sprite with
+    one <symbol> per glyph, plus a JSON index next to it mapping each glyph
+    name to its symbol id and viewBox. Any .svg, .svgz or .svg.br extension
+    on sprite_filename is replaced by the one matching `compress`, and the
+    index is named after the sprite with a .json extension. Returns the
+    paths of the sprite and the index.
+    """
+    parts = ['<svg xmlns="http://www.w3.org/2000/svg" style="display:none">\n']
+    index = {}
+    for glyph_name, filename, view_box, svg_path in drawings:
+        parts.append('<symbol id=%s viewBox="%s"><path transform="%s" d="%s"/></symbol>\n'
+                     % (quoteattr(filename), " ".join(view_box), SVG_FLIP_TRANSFORM, svg_path))
+        index[glyph_name] = {'id': filename, 'viewBox': " ".join(view_box)}
+    parts.append('</svg>')
+    
+    root = sprite_filename
+    # Check longer extensions first, so '.svg.br' isn't taken for '.svg'
+    for ext in sorted(COMPRESSED_EXTENSIONS.values(), key=len, reverse=True):
+        if root.lower().endswith(ext):
+            root = root[:-len(ext)]
+            break
+    # The sprite always ends in an SVG extension, so the index can't overwrite it
+    sprite_filename = root + COMPRESSED_EXTENSIONS[compress]
+    index_filename = root + '.json'
+    
+    write_file(sprite_filename, encode_svg("".join(parts), compress))
+    write_file(index_filename, json.dumps(index, indent=1).encode('utf-8'))
+    
+    return sprite_filename, index_filename
+
+def extract_glyphs_to_svg(woff_path, output_dir, precision=1, compact=False, uniform_bbox=False,
+                          compress='none', sprite=None, sync=False):
     try:
         # Load the font
-        font = TTFont(woff_path)
+        font = TTFont(woff_path, lazy=True)
         
         # Ensure 'glyf' table is present
         if 'glyf' not in font:
             print("No 'glyf' table found in the WOFF file.")
             return
         
-        # Create the output directory if it doesn't exist
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        if compress == 'brotli' and brotli is None:
+            print("Brotli compression requires the brotli module (install with `pip install brotli`).")
+            return
         
-        # Get glyph set and Unicode cmap
-        glyph_set = font.getGlyphSet()
+        # Get Unicode cmap
         cmap = font['cmap'].getBestCmap()
-        unicode_to_glyph = {v: k for k, v in cmap.items()}
+        # Map each glyph name to its lowest Unicode code point. If all code points
+        # are ever needed, build a collections.defaultdict(list) here instead.
+        glyph_to_unicode = {name: code for code, name in sorted(cmap.items(), reverse=True)}
         
-        # Keep track of used filenames to avoid duplicates
+        # Keep track of used filenames to avoid duplicates, and of the next
+        # suffix to try for each base name
         used_filenames = set()
+        name_counts = defaultdict(int)
         
-        # Extract each glyph and save as SVG
-        for glyph_name in glyph_set.keys():
-            glyph = glyph_set[glyph_name]
+        # Assign filenames up front so they don't depend on how glyphs are
+        # split between worker processes
+        glyphs = []
+        for glyph_name in font.getGlyphOrder():
+            # Construct a unique filename
+            # Attempt to use Unicode code point if available
+            unicode_value = glyph_to_unicode.get(glyph_name)
+            if unicode_value is not None:
+                # Format Unicode value as 'U+XXXX'
+                unicode_str = f"U+{unicode_value:04X}"
+                filename_base = f"{unicode_str}_{glyph_name}"
+            else:
+                # If no Unicode mapping, use glyph name and index
+                filename_base = f"{glyph_name}"
             
-            # Calculate bounding box
-            bounds_pen = BoundsPen(glyph_set)
-            glyph.draw(bounds_pen)
-            bounds = bounds_pen.bounds
+            # Sanitize filename
+            filename_base = sanitize_filename(filename_base)
             
-            if bounds:
-                min_x, min_y, max_x, max_y = bounds
-                width = max_x - min_x
-                height = max_y - min_y
-                
-                # Generate SVG path data with Y-axis flipped
-                pen = SVGPathPen(glyph_set)
-                transform = (1, 0, 0, -1, 0, 0)  # Flip Y-axis
-                tpen = TransformPen(pen, transform)
-                glyph.draw(tpen)
-                svg_path = pen.getCommands()
-                
-                # Adjust viewBox for flipped Y-axis
-                new_min_y = -max_y
-                
-                # Construct a unique filename
-                # Attempt to use Unicode code point if available
-                unicode_values = [code for code, name in unicode_to_glyph.items() if name == glyph_name]
-                if unicode_values:
-                    # Use the first Unicode value if multiple are present
-                    unicode_value = unicode_values[0]
-                    # Format Unicode value as 'U+XXXX'
-                    unicode_str = f"U+{unicode_value:04X}"
-                    filename_base = f"{unicode_str}_{glyph_name}"
-                else:
-                    # If no Unicode mapping, use glyph name and index
-                    filename_base = f"{glyph_name}"
-                
-                # Sanitize filename
-                filename_base = sanitize_filename(filename_base)
-                
-                # Ensure filename is unique
-                filename = filename_base
-                counter = 1
-                while filename.lower() in used_filenames:
-                    filename = f"{filename_base}_{counter}"
-                    counter += 1
-                used_filenames.add(filename.lower())
-                
-                svg_filename = os.path.join(output_dir, f"{filename}.svg")
-                
-                # Create SVG content
-                svg_content = f'''<svg xmlns="http://www.w3.org/2000/svg" viewBox="{min_x} {new_min_y} {width} {height}" width="{width}" height="{height}">
-<path d="{svg_path}"/>
-</svg>'''
-                
-                # Save SVG file
-                with open(svg_filename, 'w') as svg_file:
-                    svg_file.write(svg_content)
-                
-                print(f"Extracted glyph '{glyph_name}' to '{svg_filename}'")
+            # Ensure filename is unique. Suffixes below the base name's count
+            # are already taken, so probing only happens when a suffixed name
+            # collides with another glyph's base name.
+            key = filename_base.lower()
+            counter = name_counts[key]
+            filename = filename_base if counter == 0 else f"{filename_base}_{counter}"
+            while filename.lower() in used_filenames:
+                counter += 1
+                filename = f"{filename_base}_{counter}"
+            name_counts[key] = counter + 1
+            used_filenames.add(filename.lower())
+            
+            glyphs.append((glyph_name, filename))
     
     except Exception as e:
         print(f"Error reading WOFF file: {e}")
+        return
+    
+    # Create the output directory if it doesn't exist. This happens once the
+    # font has been read, and outside the try blocks so that a failure here
+    # isn't reported as a font error.
+    os.makedirs(output_dir, exist_ok=True)
+    
+    try:
+        # Split the glyphs into one chunk per CPU, balanced by estimated cost
+        # so that no worker is left with most of the heavy glyphs
+        workers = os.cpu_count() or 1
+        glyf = font['glyf']
+        glyph_costs = {}
+        costs = [glyph_cost(glyf, glyph_name, glyph_costs) for glyph_name, _ in glyphs]
+        chunks = partition_glyphs(glyphs, costs, workers)
+        
+        # Chunks interleave glyphs, so results are sorted back into the font's glyph order
+        order = {glyph_name: i for i, (glyph_name, _) in enumerate(glyphs)}
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            if sprite:
+                # Draw in parallel, then save everything as one sprite
+                futures = [executor.submit(draw_chunk, woff_path, chunk, precision, compact, uniform_bbox)
+                           for chunk in chunks]
+                drawings = [drawing for future in futures for drawing in future.result()]
+                drawings.sort(key=lambda drawing: order[drawing[0]])
+                sprite_filename, index_filename = write_sprite(os.path.join(output_dir, sprite), drawings, compress)
+                print(f"Extracted {len(drawings)} glyphs to '{sprite_filename}' (index: '{index_filename}')")
+            else:
+                futures = [
+                    executor.submit(process_chunk, woff_path, chunk, output_dir,
+                                    precision=precision, compact=compact, uniform_bbox=uniform_bbox,
+                                    compress=compress)
+                    for chunk in chunks
+                ]
+                extracted = [item for future in futures for item in future.result()]
+                extracted.sort(key=lambda item: order[item[0]])
+                for glyph_name, svg_filename in extracted:
+                    print(f"Extracted glyph '{glyph_name}' to '{svg_filename}'")
+        
+        # Files are written without fsync; flush everything once at the end if asked
+        if sync:
+            # os.sync() only exists on Unix
+            if hasattr(os, 'sync'):
+                os.sync()
+            else:
+                print("--sync is only supported on Unix; files were written but not flushed to disk.")
+    
+    except Exception as e:
+        print(f"Error extracting glyphs: {e}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python extract_glyphs.py <path_to_woff_file> <output_directory>")
-    else:
-        woff_path = sys.argv[1]
-        output_dir = sys.argv[2]
-        extract_glyphs_to_svg(woff_path, output_dir)
+    parser = argparse.ArgumentParser(description="Extract glyphs from a WOFF2 font file as individual SVG files.")
+    parser.add_argument("woff_path", help="Path to the input WOFF2 font file.")
+    parser.add_argument("output_dir", help="Path to the directory where the SVG files will be saved.")
+    parser.add_argument("--precision", type=int, default=1,
+                        help="Maximum number of decimal places in path coordinates (default: 1, 0 rounds to integers).")
+    parser.add_argument("--compact", action="store_true",
+                        help="Use relative path commands where they are shorter.")
+    parser.add_argument("--uniform-bbox", action="store_true",
+                        help="Use the font-wide bounding box as every glyph's viewBox (also keeps empty glyphs).")
+    parser.add_argument("--compress", choices=sorted(COMPRESSED_EXTENSIONS), default="none",
+                        help="Compress the SVG files as .svgz (gzip) or .svg.br (brotli) (default: none).")
+    parser.add_argument("--sprite", metavar="FILENAME",
+                        help="Save all glyphs as <symbol> elements in a single SVG sprite with this name "
+                             "(in the output directory), plus a JSON index, instead of one file per glyph. "
+                             "The sprite gets the .svg, .svgz or .svg.br extension matching --compress.")
+    parser.add_argument("--sync", action="store_true",
+                        help="Flush all written files to disk once at the end (files are not fsynced individually). "
+                             "Unix only.")
+    args = parser.parse_args()
+    extract_glyphs_to_svg(args.woff_path, args.output_dir, precision=args.precision,
+                          compact=args.compact, uniform_bbox=args.uniform_bbox,
+                          compress=args.compress, sprite=args.sprite, sync=args.sync)